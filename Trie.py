@@ -5,70 +5,126 @@ Trie Data Structure Implementation for Efficient Word Search
 This module provides an optimized Trie implementation for the autocomplete
 system, enabling fast word searches and context retrieval from sentences.
 
+Nodes are stored arena-style in contiguous numpy arrays instead of one
+Python object per node: a single `(capacity, alphabet)` int32 child table
+plus a boolean end-of-word flag array, addressed by 32-bit node ids.
+This keeps traversal cache-friendly and shrinks per-node memory from a
+full Python object to a few dozen bytes.
+
 Author: Team 3
 Date: 2024
 """
 
-from typing import Dict, List, Optional, Set, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz.distance import Levenshtein as _RapidfuzzLevenshtein
+except ImportError:
+    _RapidfuzzLevenshtein = None
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+
+# Supported characters: lowercase letters, digits and apostrophe.
+# Words are normalized to this alphabet on insert and search.
+_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789'"
+_ALPHABET_SIZE = len(_ALPHABET)
+_CHAR_TO_INDEX = {char: index for index, char in enumerate(_ALPHABET)}
+_ALPHABET_CODES = tuple(ord(char) for char in _ALPHABET)
+
+# Initial arena capacity (doubled on demand)
+_INITIAL_CAPACITY = 256
+
 
+if _njit is not None:
+    @_njit(cache=True)
+    def _descend(children: np.ndarray, indices: np.ndarray) -> int:
+        """Compiled child-table descent; returns the node id or -1"""
+        node = 0
+        for i in range(indices.shape[0]):
+            node = children[node, indices[i]]
+            if node == 0:
+                return -1
+        return node
+else:
+    _descend = None
 
-@dataclass
-class TrieNode:
+
+def _normalize_word(word: str) -> str:
     """
-    Trie node structure
-    
-    Attributes:
-        char: Character stored in this node
-        children: Dictionary of child nodes (character -> node)
-        sentences_id: Dictionary mapping sentence IDs to word positions
-        is_end_of_word: Indicates if this node marks the end of a word
+    Normalizes a word to the Trie alphabet
+
+    Args:
+        word: Word to normalize
+
+    Returns:
+        Lowercase word containing only supported characters
     """
-    
-    def __init__(self, char: str):
-        self.char = char
-        self.children: Dict[str, 'TrieNode'] = {}
-        self.sentences_id: Dict[int, List[int]] = {}
-        self.is_end_of_word: bool = False
-    
-    def add_sentence(self, sentence_id: int, position: int) -> None:
-        """
-        Adds a sentence and position to this node
-        
-        Args:
-            sentence_id: Unique sentence ID
-            position: Word position in the sentence
-        """
-        if sentence_id not in self.sentences_id:
-            self.sentences_id[sentence_id] = []
-        self.sentences_id[sentence_id].append(position)
-    
-    def get_sentence_count(self) -> int:
-        """Returns the number of unique sentences in this node"""
-        return len(self.sentences_id)
+    word = word.lower().strip()
+    if all(char in _CHAR_TO_INDEX for char in word):
+        return word
+    return ''.join(char for char in word if char in _CHAR_TO_INDEX)
 
 
 class Trie:
     """
     Trie data structure for efficient word search
-    
+
     This implementation provides:
     - Fast word insertion with sentence context
     - Efficient word search
     - Sentence retrieval containing specific words
     - Support for typo-tolerant searches
+
+    Nodes live in a flat arena: `_children[node_id, char_index]` holds the
+    child node id (0 = absent, since node 0 is the root and can never be a
+    child), `_is_end[node_id]` marks complete words and `_sentences` is a
+    sidecar list mapping node ids to their sentence/position dictionaries.
     """
-    
+
     def __init__(self):
         """Initializes an empty Trie"""
-        self.root = TrieNode('')
+        self._children = np.zeros((_INITIAL_CAPACITY, _ALPHABET_SIZE), dtype=np.int32)
+        self._is_end = np.zeros(_INITIAL_CAPACITY, dtype=np.bool_)
+        self._sentences: List[Optional[Dict[int, List[int]]]] = [None]
+        self._n_nodes = 1  # Only root node (id 0) initially
+        self._sum_word_lengths = 0
         self.total_words = 0
-        self.total_nodes = 1  # Only root node initially
-    
+
+    @property
+    def total_nodes(self) -> int:
+        """Total number of allocated nodes (including the root)"""
+        return self._n_nodes
+
+    def _grow(self) -> None:
+        """Doubles the arena capacity, preserving existing nodes"""
+        new_capacity = self._children.shape[0] * 2
+        children = np.zeros((new_capacity, _ALPHABET_SIZE), dtype=np.int32)
+        children[:self._n_nodes] = self._children[:self._n_nodes]
+        self._children = children
+
+        is_end = np.zeros(new_capacity, dtype=np.bool_)
+        is_end[:self._n_nodes] = self._is_end[:self._n_nodes]
+        self._is_end = is_end
+
+    def _alloc_node(self) -> int:
+        """Allocates a new node and returns its id"""
+        if self._n_nodes >= self._children.shape[0]:
+            self._grow()
+        node_id = self._n_nodes
+        self._n_nodes += 1
+        self._sentences.append(None)
+        return node_id
+
     def insert(self, word: str, sentence_id: int, position: int) -> None:
         """
         Inserts a word into the Trie with context information
-        
+
         Args:
             word: Word to insert
             sentence_id: ID of the sentence containing the word
@@ -76,173 +132,353 @@ class Trie:
         """
         if not word:
             return
-        
-        word = word.lower().strip()
+
+        word = _normalize_word(word)
         if not word:
             return
-        
-        node = self.root
-        
+
+        node = 0
+
         # Traverse the word character by character
         for char in word:
-            if char not in node.children:
-                node.children[char] = TrieNode(char)
-                self.total_nodes += 1
-            node = node.children[char]
-        
+            index = _CHAR_TO_INDEX[char]
+            child = int(self._children[node, index])
+            if child == 0:
+                child = self._alloc_node()
+                self._children[node, index] = child
+            node = child
+
         # Mark end of word and add context information
-        node.is_end_of_word = True
-        node.add_sentence(sentence_id, position)
+        if not self._is_end[node]:
+            self._is_end[node] = True
+            self._sum_word_lengths += len(word)
+        sentences = self._sentences[node]
+        if sentences is None:
+            sentences = {}
+            self._sentences[node] = sentences
+        if sentence_id not in sentences:
+            sentences[sentence_id] = []
+        sentences[sentence_id].append(position)
         self.total_words += 1
-    
-    def search(self, word: str) -> Optional[TrieNode]:
+
+    def insert_sentence(self, words: List[str], sentence_id: int) -> None:
+        """
+        Inserts all words of a sentence in one call
+
+        Bulk counterpart of `insert`: the per-word loop and the character
+        descent both run inside this method with the arena arrays hoisted
+        to locals, so loading pays one Python call per sentence instead
+        of one per word.
+
+        Args:
+            words: Words of the sentence, in order
+            sentence_id: ID of the sentence containing the words
+        """
+        char_to_index = _CHAR_TO_INDEX
+        is_end = self._is_end
+        all_sentences = self._sentences
+
+        for position, word in enumerate(words):
+            if not word:
+                continue
+            word = _normalize_word(word)
+            if not word:
+                continue
+
+            children = self._children
+            node = 0
+            for char in word:
+                index = char_to_index[char]
+                child = int(children[node, index])
+                if child == 0:
+                    child = self._alloc_node()
+                    # _alloc_node may have grown (reallocated) the arena
+                    children = self._children
+                    is_end = self._is_end
+                    children[node, index] = child
+                node = child
+
+            if not is_end[node]:
+                is_end[node] = True
+                self._sum_word_lengths += len(word)
+            sentences = all_sentences[node]
+            if sentences is None:
+                sentences = {}
+                all_sentences[node] = sentences
+            positions = sentences.get(sentence_id)
+            if positions is None:
+                sentences[sentence_id] = [position]
+            else:
+                positions.append(position)
+            self.total_words += 1
+
+    def _find_node(self, word: str) -> int:
+        """
+        Finds the node reached by following a (normalized) word
+
+        Args:
+            word: Normalized word or prefix
+
+        Returns:
+            Node id, or -1 if the path does not exist
+        """
+        if _descend is not None and word:
+            char_to_index = _CHAR_TO_INDEX
+            try:
+                indices = [char_to_index[char] for char in word]
+            except KeyError:
+                return -1
+            return int(_descend(self._children, np.asarray(indices, dtype=np.int64)))
+
+        children = self._children
+        node = 0
+        for char in word:
+            index = _CHAR_TO_INDEX.get(char)
+            if index is None:
+                return -1
+            node = int(children[node, index])
+            if node == 0:
+                return -1
+        return node
+
+    def search(self, word: str) -> Optional[int]:
         """
         Searches for a word in the Trie
-        
+
         Args:
             word: Word to search for
-            
+
         Returns:
-            Trie node if the word exists, None otherwise
+            Node id if the word exists, None otherwise
         """
         if not word:
             return None
-        
-        word = word.lower().strip()
-        node = self.root
-        
-        for char in word:
-            if char not in node.children:
-                return None
-            node = node.children[char]
-        
-        return node if node.is_end_of_word else None
-    
+
+        word = _normalize_word(word)
+        node = self._find_node(word)
+
+        if node > 0 and self._is_end[node]:
+            return node
+        return None
+
     def get_sentences_of_word(self, word: str) -> Optional[Dict[int, List[int]]]:
         """
         Gets all sentences containing a specific word
-        
+
         Args:
             word: Word to search for
-            
+
         Returns:
             Dictionary mapping sentence IDs to word positions,
             or None if the word doesn't exist
         """
         node = self.search(word)
-        return node.sentences_id if node else None
-    
+        return self._sentences[node] if node is not None else None
+
     def get_word_count(self) -> int:
         """Returns the total number of unique words in the Trie"""
         return self.total_words
-    
+
     def get_node_count(self) -> int:
         """Returns the total number of nodes in the Trie"""
-        return self.total_nodes
-    
+        return self._n_nodes
+
     def get_statistics(self) -> Dict[str, int]:
         """
         Gets Trie statistics
-        
+
         Returns:
             Dictionary with Trie statistics
         """
         return {
             'total_words': self.total_words,
-            'total_nodes': self.total_nodes,
+            'total_nodes': self._n_nodes,
             'average_word_length': self._calculate_average_word_length()
         }
-    
+
     def _calculate_average_word_length(self) -> float:
         """Calculates the average length of words in the Trie"""
         if self.total_words == 0:
             return 0.0
-        
-        total_length = 0
-        self._count_word_lengths(self.root, 0, total_length)
-        return total_length / self.total_words
-    
-    def _count_word_lengths(self, node: TrieNode, current_length: int, total_length: int) -> None:
-        """Helper method to count word lengths"""
-        if node.is_end_of_word:
-            total_length += current_length
-        
-        for child in node.children.values():
-            self._count_word_lengths(child, current_length + 1, total_length)
-    
+        return self._sum_word_lengths / self.total_words
+
     def prefix_search(self, prefix: str) -> List[str]:
         """
         Searches for all words starting with a given prefix
-        
+
         Args:
             prefix: Prefix to search for
-            
+
         Returns:
             List of words starting with the prefix
         """
         if not prefix:
             return []
-        
-        prefix = prefix.lower().strip()
-        node = self.root
-        
-        # Navigate to the prefix node
-        for char in prefix:
-            if char not in node.children:
-                return []
-            node = node.children[char]
-        
+
+        prefix = _normalize_word(prefix)
+        node = self._find_node(prefix)
+        if node <= 0:
+            return []
+
         # Collect all words starting with this prefix
-        words = []
+        words: List[str] = []
         self._collect_words_from_node(node, prefix, words)
         return words
-    
-    def _collect_words_from_node(self, node: TrieNode, current_word: str, words: List[str]) -> None:
-        """Helper method to collect words from a node"""
-        if node.is_end_of_word:
-            words.append(current_word)
-        
-        for char, child in node.children.items():
-            self._collect_words_from_node(child, current_word + char, words)
-    
+
+    def _collect_words_from_node(self, node: int, current_word: str, words: List[str]) -> None:
+        """
+        Helper method to collect words from a node (iterative DFS)
+
+        Words are built in one shared bytearray trimmed to the depth of
+        the node being visited, so each edge appends a single byte rather
+        than allocating a new prefix string, and a string is only created
+        at end-of-word nodes.
+        """
+        children = self._children
+        is_end = self._is_end
+
+        buffer = bytearray()
+        # Stack of (node_id, depth, char_code); char_code 0 marks the root
+        stack: List[Tuple[int, int, int]] = [(node, 0, 0)]
+        while stack:
+            node, depth, code = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(code)
+            if is_end[node]:
+                words.append(current_word + buffer.decode())
+            row = children[node]
+            for index in range(_ALPHABET_SIZE):
+                child = row[index]
+                if child:
+                    stack.append((int(child), depth + 1, _ALPHABET_CODES[index]))
+
     def fuzzy_search(self, word: str, max_distance: int = 1) -> List[str]:
         """
         Fuzzy search for words with limited edit distance
-        
+
+        Carries a Levenshtein DP row down the trie and prunes any subtree
+        whose best possible distance already exceeds `max_distance`, so
+        only nodes within the edit radius are visited.
+
         Args:
             word: Word to search for
             max_distance: Maximum allowed edit distance
-            
+
         Returns:
             List of words matching within the specified distance
         """
-        # This is a simplified implementation
-        # In a complete implementation, we would use algorithms like Levenshtein
-        results = []
-        self._fuzzy_search_recursive(self.root, word, "", max_distance, results)
+        if not word:
+            return []
+
+        children = self._children
+        is_end = self._is_end
+        length = len(word)
+        results: List[str] = []
+
+        buffer = bytearray()
+        # Explicit stack of (node_id, depth, char_code, DP row vs. target)
+        stack: List[Tuple[int, int, int, List[int]]] = [(0, 0, 0, list(range(length + 1)))]
+        while stack:
+            node, depth, code, row = stack.pop()
+            if depth:
+                del buffer[depth - 1:]
+                buffer.append(code)
+            if is_end[node] and row[-1] <= max_distance:
+                results.append(buffer.decode())
+
+            node_row = children[node]
+            for index in range(_ALPHABET_SIZE):
+                child = node_row[index]
+                if not child:
+                    continue
+                char = _ALPHABET[index]
+                next_row = [row[0] + 1]
+                for j in range(1, length + 1):
+                    next_row.append(min(
+                        next_row[j - 1] + 1,               # insertion
+                        row[j] + 1,                        # deletion
+                        row[j - 1] + (word[j - 1] != char)  # substitution
+                    ))
+                # Prune the whole subtree when no extension can recover
+                if min(next_row) <= max_distance:
+                    stack.append((int(child), depth + 1, _ALPHABET_CODES[index], next_row))
         return results
-    
-    def _fuzzy_search_recursive(self, node: TrieNode, target: str, current: str, 
-                              remaining_distance: int, results: List[str]) -> None:
-        """Helper method for recursive fuzzy search"""
-        if node.is_end_of_word:
-            # Calculate edit distance (simplified implementation)
-            if self._levenshtein_distance(current, target) <= remaining_distance:
-                results.append(current)
-        
-        for char, child in node.children.items():
-            self._fuzzy_search_recursive(child, target, current + char, 
-                                       remaining_distance, results)
-    
+
+    def fuzzy_collect(self, word: str, max_distance: int = 1) -> Dict[int, List[int]]:
+        """
+        Collects sentence contexts for all words within an edit distance
+
+        Same pruned DP-row descent as `fuzzy_search`, but instead of
+        rebuilding the matched words it merges the sentence/position
+        dictionaries of every terminal node within the edit radius. This
+        replaces generating `3·alphabet·len(word)` candidate strings with
+        a single walk that only visits nodes still within reach.
+
+        Args:
+            word: Word to search for
+            max_distance: Maximum allowed edit distance
+
+        Returns:
+            Dictionary mapping sentence IDs to word positions, merged
+            across all matching words (empty if nothing matches)
+        """
+        merged: Dict[int, List[int]] = {}
+        if not word:
+            return merged
+
+        word = _normalize_word(word)
+        if not word:
+            return merged
+
+        children = self._children
+        is_end = self._is_end
+        sentences = self._sentences
+        length = len(word)
+
+        # Explicit stack of (node_id, DP row vs. target)
+        stack: List[Tuple[int, List[int]]] = [(0, list(range(length + 1)))]
+        while stack:
+            node, row = stack.pop()
+            if is_end[node] and row[-1] <= max_distance:
+                node_sentences = sentences[node]
+                if node_sentences:
+                    for sentence_id, positions in node_sentences.items():
+                        if sentence_id in merged:
+                            merged[sentence_id].extend(positions)
+                        else:
+                            merged[sentence_id] = list(positions)
+
+            node_row = children[node]
+            for index in range(_ALPHABET_SIZE):
+                child = node_row[index]
+                if not child:
+                    continue
+                char = _ALPHABET[index]
+                next_row = [row[0] + 1]
+                for j in range(1, length + 1):
+                    next_row.append(min(
+                        next_row[j - 1] + 1,               # insertion
+                        row[j] + 1,                        # deletion
+                        row[j - 1] + (word[j - 1] != char)  # substitution
+                    ))
+                if min(next_row) <= max_distance:
+                    stack.append((int(child), next_row))
+        return merged
+
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Calculates Levenshtein distance between two strings"""
-        # Simplified implementation - use optimized library in production
+        if _RapidfuzzLevenshtein is not None:
+            return _RapidfuzzLevenshtein.distance(s1, s2)
+
+        # Pure-Python fallback when rapidfuzz is not installed
         if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-        
+            s1, s2 = s2, s1
+
         if len(s2) == 0:
             return len(s1)
-        
+
+        _min = min
         previous_row = list(range(len(s2) + 1))
         for i, c1 in enumerate(s1):
             current_row = [i + 1]
@@ -250,104 +486,101 @@ class Trie:
                 insertions = previous_row[j + 1] + 1
                 deletions = current_row[j] + 1
                 substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
+                current_row.append(_min(insertions, deletions, substitutions))
             previous_row = current_row
-        
+
         return previous_row[-1]
-    
+
+    def shrink_to_fit(self) -> None:
+        """
+        Trims arena capacity down to the allocated nodes
+
+        Doubling growth can leave up to half the arena unused once
+        loading is done; copying the live rows into exactly-sized arrays
+        releases that slack for read-only use.
+        """
+        if self._children.shape[0] > self._n_nodes:
+            self._children = self._children[:self._n_nodes].copy()
+            self._is_end = self._is_end[:self._n_nodes].copy()
+
     def clear(self) -> None:
         """Clears the Trie, removing all data"""
-        self.root = TrieNode('')
+        self._children = np.zeros((_INITIAL_CAPACITY, _ALPHABET_SIZE), dtype=np.int32)
+        self._is_end = np.zeros(_INITIAL_CAPACITY, dtype=np.bool_)
+        self._sentences = [None]
+        self._n_nodes = 1
+        self._sum_word_lengths = 0
         self.total_words = 0
-        self.total_nodes = 1
 
     def search_similar_words(self, word: str, max_distance: int = 2) -> List[Tuple[str, int]]:
         """
         Searches for words similar to the given word within a maximum distance
-        
+
         Args:
             word: Word to search for
             max_distance: Maximum Levenshtein distance allowed
-            
+
         Returns:
             List of tuples with (word, distance) sorted by distance
         """
         if not word:
             return []
-        
+
         similar_words = []
-        
+
         # Get all words from the Trie
         all_words = self._get_all_words()
-        
+
         for trie_word in all_words:
             distance = self._levenshtein_distance(word, trie_word)
             if distance <= max_distance:
                 similar_words.append((trie_word, distance))
-        
+
         # Sort by distance and then alphabetically
         similar_words.sort(key=lambda x: (x[1], x[0]))
         return similar_words
-    
+
     def _get_all_words(self) -> List[str]:
         """
         Gets all words stored in the Trie
-        
+
         Returns:
             List of all words
         """
-        words = []
-        self._collect_all_words(self.root, "", words)
+        words: List[str] = []
+        self._collect_words_from_node(0, "", words)
         return words
-    
-    def _collect_all_words(self, node: TrieNode, current_word: str, words: List[str]) -> None:
-        """
-        Recursively collects all words from the Trie
-        
-        Args:
-            node: Current Trie node
-            current_word: Current word being built
-            words: List to store collected words
-        """
-        if node.is_end_of_word:
-            words.append(current_word)
-        
-        for char, child in node.children.items():
-            self._collect_all_words(child, current_word + char, words)
-    
+
     def get_word_frequency(self, word: str) -> int:
         """
         Gets the frequency of a word (number of sentences containing it)
-        
+
         Args:
             word: Word to check
-            
+
         Returns:
             Number of sentences containing the word
         """
-        node = self.search(word)
-        if node:
-            return len(node.sentences_id)
-        return 0
-    
+        sentences = self.get_sentences_of_word(word)
+        return len(sentences) if sentences else 0
+
     def get_most_common_words(self, limit: int = 10) -> List[Tuple[str, int]]:
         """
         Gets the most common words in the Trie
-        
+
         Args:
             limit: Maximum number of words to return
-            
+
         Returns:
             List of tuples with (word, frequency) sorted by frequency
         """
         word_frequencies = []
         all_words = self._get_all_words()
-        
+
         for word in all_words:
             frequency = self.get_word_frequency(word)
             word_frequencies.append((word, frequency))
-        
+
         # Sort by frequency (descending) and then alphabetically
         word_frequencies.sort(key=lambda x: (-x[1], x[0]))
         return word_frequencies[:limit]
-
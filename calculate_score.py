@@ -10,17 +10,166 @@ Author: Team 3
 Date: 2024
 """
 
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
+import heapq
+import os
 import string
 import logging
 
+try:
+    from rapidfuzz.distance import Levenshtein as _RapidfuzzLevenshtein
+    from rapidfuzz.process import cdist as _rapidfuzz_cdist
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    logging.warning("rapidfuzz not available, falling back to slower implementations")
+
 try:
     import Levenshtein
     LEVENSHTEIN_AVAILABLE = True
 except ImportError:
     LEVENSHTEIN_AVAILABLE = False
-    logging.warning("Levenshtein not available, using basic implementation")
+    if not RAPIDFUZZ_AVAILABLE:
+        logging.warning("Levenshtein not available, using basic implementation")
+
+
+# Maximum number of suggestions returned by the scoring pipeline
+MAX_RESULTS = 5
+
+# Candidate count above which the batched rapidfuzz comparison pays off
+# over a plain Python loop
+_CDIST_MIN_CANDIDATES = 32
+
+# Candidate count above which scoring is spread across worker processes;
+# below this the process-pool round trip costs more than it saves
+_PARALLEL_MIN_SENTENCES = 5000
+
+# Worker pool for parallel scoring, created on first use and reused
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Returns the shared scoring process pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor()
+    return _executor
+
+
+def _score_chunk(user_sentence: str, sentences: List[str],
+                 base_index: int) -> List[Tuple[int, 'AutoCompleteData']]:
+    """
+    Scores one chunk of candidate sentences in a worker process
+
+    Args:
+        user_sentence: Preprocessed user sentence
+        sentences: Candidate sentences of this chunk
+        base_index: Index of the first sentence within the full candidate list
+
+    Returns:
+        List of (candidate index, scored data) pairs
+    """
+    user_words = user_sentence.split()
+    results = []
+    for offset, sentence in enumerate(sentences):
+        try:
+            data = _score_calculator._calculate_single_sentence_score(
+                user_words, sentence, user_sentence
+            )
+        except Exception as e:
+            logging.error(f"Error calculating score for sentence {base_index + offset}: {e}")
+            continue
+        if data:
+            results.append((base_index + offset, data))
+    return results
+
+# Single translation table combining lowercasing and punctuation
+# removal, so preprocessing is one C-level pass plus a split (which
+# already collapses the whitespace runs the punctuation leaves behind)
+_PREPROCESS_TABLE = str.maketrans(
+    string.ascii_uppercase + string.punctuation,
+    string.ascii_lowercase + ' ' * len(string.punctuation)
+)
+
+
+def _myers_distance(s1: str, s2: str) -> int:
+    """
+    Myers' bit-parallel Levenshtein distance (Hyyrö formulation)
+
+    Encodes one DP column per pattern character in a machine-word bitmask,
+    so each text character costs a handful of bitwise operations instead
+    of a full DP row. Intended for patterns up to 64 characters; above
+    that the masks exceed a machine word and the plain DP is preferable.
+
+    Args:
+        s1: Pattern string
+        s2: Text string
+
+    Returns:
+        Levenshtein distance between the strings
+    """
+    length = len(s1)
+    if length == 0:
+        return len(s2)
+
+    # Bitmask of positions where each pattern character occurs
+    peq: Dict[str, int] = {}
+    for index, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << index)
+
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+    vp = mask
+    vn = 0
+    distance = length
+
+    for char in s2:
+        eq = peq.get(char, 0)
+        d0 = (((eq & vp) + vp) ^ vp) | eq | vn
+        hp = vn | (~(d0 | vp) & mask)
+        hn = vp & d0
+        if hp & last:
+            distance += 1
+        if hn & last:
+            distance -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        vp = hn | (~(d0 | hp) & mask)
+        vn = hp & d0
+
+    return distance
+
+
+@lru_cache(maxsize=131072)
+def _capped_change_distance(word_a: str, word_b: str) -> int:
+    """
+    Cached Levenshtein distance used for change-type detection
+
+    The same (user word, sentence word) pairs recur across many candidate
+    sentences within one query, so results are memoized. Callers must
+    normalize the argument order — the distance is symmetric and sorting
+    the pair doubles the hit rate. Values above 1 may be capped at 2
+    since only distance 1 is meaningful to the caller.
+
+    Args:
+        word_a: First word (lexicographically smaller)
+        word_b: Second word
+
+    Returns:
+        Levenshtein distance, capped at 2 when a fast backend is used
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return _RapidfuzzLevenshtein.distance(word_a, word_b, score_cutoff=1)
+    if LEVENSHTEIN_AVAILABLE:
+        return Levenshtein.distance(word_a, word_b)
+    if len(word_a) <= 64:
+        return _myers_distance(word_a, word_b)
+    return _score_calculator._basic_levenshtein_distance(word_a, word_b, max_distance=1)
 
 
 # Constants for error types
@@ -31,6 +180,15 @@ class ErrorTypes:
     SUBSTITUTION = "substitution"
 
 
+# Penalty per error position within the sentence; positions beyond the
+# tuple fall back to the default. Built once at import instead of a
+# nested dict per calculator instance.
+_SUBSTITUTION_PENALTIES = (5, 4, 3, 2)
+_SUBSTITUTION_DEFAULT_PENALTY = 1
+_ADDITION_DELETION_PENALTIES = (10, 8, 6, 4)
+_ADDITION_DELETION_DEFAULT_PENALTY = 2
+
+
 @dataclass
 class AutoCompleteData:
     """
@@ -42,6 +200,12 @@ class AutoCompleteData:
         offset: Starting position in source text
         score: Calculated score for this suggestion
     """
+    # Slots instead of a per-instance __dict__: the scoring pipeline
+    # creates one of these per surviving candidate, so the footprint adds
+    # up. Declared manually to keep Python 3.8 compatibility (dataclass
+    # slots=True requires 3.10).
+    __slots__ = ('completed_sentence', 'source_text', 'offset', 'score')
+
     completed_sentence: str
     source_text: str
     offset: int
@@ -63,52 +227,71 @@ class ScoreCalculator:
     
     def __init__(self):
         """Initializes the score calculator"""
-        self.punctuation_translator = str.maketrans("", "", string.punctuation)
-        
-        # Penalty configuration
-        self.penalty_config = {
-            ErrorTypes.SUBSTITUTION: {
-                0: 5,  # First position
-                1: 4,  # Second position
-                2: 3,  # Third position
-                3: 2,  # Fourth position
-                'default': 1  # Later positions
-            },
-            ErrorTypes.ADDITION: {
-                0: 10,
-                1: 8,
-                2: 6,
-                3: 4,
-                'default': 2
-            },
-            ErrorTypes.DELETION: {
-                0: 10,
-                1: 8,
-                2: 6,
-                3: 4,
-                'default': 2
-            }
-        }
-    
+        # Reusable row buffers for the pure-Python Levenshtein fallback:
+        # C ints in an array instead of freshly boxed Python ints per row
+        self._prev_row = array('i')
+        self._curr_row = array('i')
+
+        # Per-corpus-row caches built by index_corpus
+        self._corpus_words: Optional[List[List[str]]] = None
+        self._corpus_positions: Optional[List[Dict[str, List[int]]]] = None
+
+    def preprocess_sentence_words(self, sentence: str) -> List[str]:
+        """
+        Preprocesses a sentence directly into its list of words
+
+        Args:
+            sentence: Sentence to preprocess
+
+        Returns:
+            List of lowercase words without punctuation
+        """
+        if not sentence:
+            return []
+        return sentence.translate(_PREPROCESS_TABLE).split()
+
     def preprocess_sentence(self, sentence: str) -> str:
         """
         Preprocesses a sentence by removing punctuation and normalizing
-        
+
         Args:
             sentence: Sentence to preprocess
-            
+
         Returns:
             Preprocessed sentence in lowercase without punctuation
         """
-        if not sentence:
-            return ""
-        
-        # Remove punctuation and convert to lowercase
-        processed = sentence.translate(self.punctuation_translator).lower()
-        # Normalize multiple spaces
-        processed = ' '.join(processed.split())
-        return processed
-    
+        return ' '.join(self.preprocess_sentence_words(sentence))
+
+    def _build_word_positions(self, words: List[str]) -> Dict[str, List[int]]:
+        """
+        Maps each word of a sentence to its sorted list of positions
+
+        Args:
+            words: Tokenized sentence words
+
+        Returns:
+            Dictionary mapping word -> positions where it occurs
+        """
+        positions: Dict[str, List[int]] = {}
+        for index, word in enumerate(words):
+            positions.setdefault(word, []).append(index)
+        return positions
+
+    def index_corpus(self, sentences: List[str]) -> None:
+        """
+        Precomputes tokenized words for every corpus sentence
+
+        Scoring re-tokenized each candidate sentence on every query; this
+        stores the token list and a word -> positions map per corpus row
+        so repeated `calculate_scores` calls reuse them via the row ids
+        they receive.
+
+        Args:
+            sentences: Full corpus sentence list
+        """
+        self._corpus_words = [self.preprocess_sentence_words(sentence) for sentence in sentences]
+        self._corpus_positions = [self._build_word_positions(words) for words in self._corpus_words]
+
     def increment_score(self, current_score: float, word: str) -> float:
         """
         Increments score based on word length
@@ -133,34 +316,36 @@ class ScoreCalculator:
         Returns:
             Calculated penalty value
         """
-        if penalty_type not in self.penalty_config:
-            return 0.0
-        
-        penalties = self.penalty_config[penalty_type]
-        return penalties.get(position, penalties['default'])
+        if penalty_type == ErrorTypes.SUBSTITUTION:
+            if position < len(_SUBSTITUTION_PENALTIES):
+                return _SUBSTITUTION_PENALTIES[position]
+            return _SUBSTITUTION_DEFAULT_PENALTY
+
+        if penalty_type == ErrorTypes.ADDITION or penalty_type == ErrorTypes.DELETION:
+            if position < len(_ADDITION_DELETION_PENALTIES):
+                return _ADDITION_DELETION_PENALTIES[position]
+            return _ADDITION_DELETION_DEFAULT_PENALTY
+
+        return 0.0
     
-    def penalty_score(self, sentence: List[str], sentence_word: str, 
-                     user_word: str, current_score: float, penalty_type: str) -> float:
+    def penalty_score(self, position: int, user_word: str, sentence_word: str,
+                     current_score: float, penalty_type: str) -> float:
         """
         Applies penalty to score based on error type
-        
+
         Args:
-            sentence: List of sentence words
-            sentence_word: Word from the sentence
+            position: Position of the sentence word in the sentence
             user_word: User's word
+            sentence_word: Word from the sentence
             current_score: Current score
             penalty_type: Error type
-            
+
         Returns:
             Score adjusted with penalty
         """
-        if sentence_word not in sentence:
-            return current_score
-        
         if user_word == sentence_word:
             return current_score
-        
-        position = sentence.index(sentence_word)
+
         penalty = self.calculate_penalty(position, penalty_type)
         return current_score - penalty
     
@@ -175,11 +360,11 @@ class ScoreCalculator:
         Returns:
             Change type or None if no distance 1 change
         """
-        if LEVENSHTEIN_AVAILABLE:
-            distance = Levenshtein.distance(user_word, sentence_word)
+        if user_word <= sentence_word:
+            distance = _capped_change_distance(user_word, sentence_word)
         else:
-            distance = self._basic_levenshtein_distance(user_word, sentence_word)
-        
+            distance = _capped_change_distance(sentence_word, user_word)
+
         if distance == 1:
             if len(user_word) == len(sentence_word):
                 return ErrorTypes.SUBSTITUTION
@@ -189,34 +374,113 @@ class ScoreCalculator:
                 return ErrorTypes.ADDITION
         return None
     
-    def _basic_levenshtein_distance(self, s1: str, s2: str) -> int:
+    def _distance(self, s1: str, s2: str) -> int:
         """
-        Basic Levenshtein distance implementation
-        
+        Calculates Levenshtein distance using the fastest available backend
+
         Args:
             s1: First string
             s2: Second string
-            
+
         Returns:
             Levenshtein distance between the strings
         """
+        if RAPIDFUZZ_AVAILABLE:
+            return _RapidfuzzLevenshtein.distance(s1, s2)
+        if LEVENSHTEIN_AVAILABLE:
+            return Levenshtein.distance(s1, s2)
+        return self._basic_levenshtein_distance(s1, s2)
+
+    def _find_one_change(self, word: str, words: List[str],
+                         start: int) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Finds the first word at or after `start` within edit distance 1
+
+        Large candidate batches are compared in a single rapidfuzz cdist
+        call (vectorized across candidates) and the change type is derived
+        from the length difference, avoiding one Python-level distance
+        call per candidate.
+
+        Args:
+            word: User's word
+            words: Sentence words
+            start: First position to consider
+
+        Returns:
+            Tuple of (position, change type), or (None, None) if no word
+            within distance 1 exists
+        """
+        if RAPIDFUZZ_AVAILABLE and len(words) - start >= _CDIST_MIN_CANDIDATES:
+            remaining = words[start:]
+            distances = _rapidfuzz_cdist(
+                [word], remaining,
+                scorer=_RapidfuzzLevenshtein.distance, score_cutoff=1
+            )[0]
+            for index, distance in enumerate(distances):
+                if distance == 1:
+                    sentence_word = remaining[index]
+                    if len(word) == len(sentence_word):
+                        return start + index, ErrorTypes.SUBSTITUTION
+                    if len(word) < len(sentence_word):
+                        return start + index, ErrorTypes.DELETION
+                    return start + index, ErrorTypes.ADDITION
+            return None, None
+
+        for index in range(start, len(words)):
+            change_type = self.calculate_change_type(word, words[index])
+            if change_type:
+                return index, change_type
+        return None, None
+
+    def _basic_levenshtein_distance(self, s1: str, s2: str,
+                                    max_distance: Optional[int] = None) -> int:
+        """
+        Basic Levenshtein distance implementation
+
+        Args:
+            s1: First string
+            s2: Second string
+            max_distance: Optional cutoff; once every cell of a DP row
+                exceeds it the result is known to be above the cutoff and
+                max_distance + 1 is returned without filling the rest of
+                the table
+
+        Returns:
+            Levenshtein distance between the strings (or max_distance + 1
+            when the cutoff is exceeded)
+        """
         if len(s1) < len(s2):
-            return self._basic_levenshtein_distance(s2, s1)
-        
+            s1, s2 = s2, s1
+
         if len(s2) == 0:
             return len(s1)
-        
-        # Use dynamic programming for better performance
-        previous_row = list(range(len(s2) + 1))
+
+        # The distance is at least the length difference, so the cutoff
+        # can be checked before any DP work
+        if max_distance is not None and len(s1) - len(s2) > max_distance:
+            return max_distance + 1
+
+        # Use dynamic programming over two preallocated int buffers that
+        # are swapped per row instead of allocating a new list each pass
+        previous_row = self._prev_row
+        current_row = self._curr_row
+        del previous_row[:]
+        previous_row.extend(range(len(s2) + 1))
+        del current_row[:]
+        current_row.extend(previous_row)
+
+        _min = min
         for i, c1 in enumerate(s1):
-            current_row = [i + 1]
+            current_row[0] = i + 1
             for j, c2 in enumerate(s2):
                 insertions = previous_row[j + 1] + 1
                 deletions = current_row[j] + 1
                 substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
+                current_row[j + 1] = _min(insertions, deletions, substitutions)
+            if max_distance is not None and _min(current_row) > max_distance:
+                return max_distance + 1
+            previous_row, current_row = current_row, previous_row
+
         return previous_row[-1]
     
     def calculate_similarity_score(self, word1: str, word2: str) -> float:
@@ -237,7 +501,7 @@ class ScoreCalculator:
             return 1.0
         
         # Calculate Levenshtein distance
-        distance = self._basic_levenshtein_distance(word1, word2)
+        distance = self._distance(word1, word2)
         
         # Calculate similarity based on distance and word lengths
         max_length = max(len(word1), len(word2))
@@ -253,118 +517,168 @@ class ScoreCalculator:
         
         return max(0.0, similarity - length_penalty)
     
-    def get_word_variations(self, word: str) -> List[str]:
+    def get_word_variations(self, word: str):
         """
         Generates common word variations for fuzzy matching
-        
+
+        Deprecated: enumerating every edit-distance-1 string is wasteful
+        compared to Trie.fuzzy_search, which only visits variations that
+        actually exist in the dictionary. Kept for API compatibility as a
+        lazy generator so callers that stop early avoid building the full
+        candidate list.
+
         Args:
             word: Base word
-            
-        Returns:
-            List of word variations
+
+        Yields:
+            Unique word variations
         """
         if not word:
-            return []
-        
-        variations = [word]
-        
-        # Add common typos and variations
+            return
+
+        seen = {word}
+        yield word
+
+        # Common typos and variations
         for i in range(len(word)):
             # Character substitutions
             for char in 'abcdefghijklmnopqrstuvwxyz':
                 if char != word[i]:
                     variation = word[:i] + char + word[i+1:]
-                    variations.append(variation)
-            
+                    if variation not in seen:
+                        seen.add(variation)
+                        yield variation
+
             # Character deletions
             if len(word) > 1:
                 variation = word[:i] + word[i+1:]
-                variations.append(variation)
-            
+                if variation not in seen:
+                    seen.add(variation)
+                    yield variation
+
             # Character insertions
             for char in 'abcdefghijklmnopqrstuvwxyz':
                 variation = word[:i] + char + word[i:]
-                variations.append(variation)
-        
+                if variation not in seen:
+                    seen.add(variation)
+                    yield variation
+
         # Add character at the end
         for char in 'abcdefghijklmnopqrstuvwxyz':
             variation = word + char
-            variations.append(variation)
-        
-        return list(set(variations))  # Remove duplicates
+            if variation not in seen:
+                seen.add(variation)
+                yield variation
     
-    def update_results_list(self, results_list: List[AutoCompleteData], 
-                           new_data: AutoCompleteData, min_top_score: float) -> Tuple[List[AutoCompleteData], float]:
+    def update_results_list(self, results_heap: List[Tuple[float, int, AutoCompleteData]],
+                           new_data: AutoCompleteData, counter: int) -> List[Tuple[float, int, AutoCompleteData]]:
         """
-        Updates results list keeping only the best ones
-        
+        Updates the top-K results heap with a new candidate
+
+        The heap holds (score, counter, data) tuples ordered as a min-heap,
+        so the worst kept result is always at the root and each update is
+        O(log K) instead of rescanning the whole list.
+
         Args:
-            results_list: Current results list
+            results_heap: Current min-heap of best results
             new_data: New result to consider
-            min_top_score: Current minimum score
-            
+            counter: Monotonic insertion counter used as a tie-breaker
+
         Returns:
-            Tuple with updated list and new minimum score
+            The updated heap
         """
-        max_results = 5
-        
-        if len(results_list) < max_results:
-            results_list.append(new_data)
-            min_top_score = min(min_top_score, new_data.score)
-        elif new_data.score > min_top_score:
+        if len(results_heap) < MAX_RESULTS:
+            heapq.heappush(results_heap, (new_data.score, counter, new_data))
+        elif new_data.score > results_heap[0][0]:
             # Replace worst result
-            min_score_index = min(enumerate(results_list), key=lambda x: x[1].score)[0]
-            results_list[min_score_index] = new_data
-            min_top_score = min(results_list, key=lambda x: x.score).score
-        
-        return results_list, min_top_score
+            heapq.heappushpop(results_heap, (new_data.score, counter, new_data))
+
+        return results_heap
     
-    def calculate_scores(self, user_sentence: str, sentences_df) -> List[AutoCompleteData]:
+    def calculate_scores(self, user_sentence: str, sentences: List[str],
+                         sentence_ids=None) -> List[AutoCompleteData]:
         """
         Calculates scores for all candidate sentences
-        
+
         Args:
             user_sentence: User input sentence
-            sentences_df: DataFrame with candidate sentences
-            
+            sentences: Candidate sentence list
+            sentence_ids: Optional corpus row ids parallel to `sentences`,
+                used to look up the caches built by index_corpus
+
         Returns:
             List of top 5 results ordered by score
         """
-        if sentences_df.empty:
+        if len(sentences) == 0:
             return []
-        
-        autocomplete_results = []
-        user_sentence = self.preprocess_sentence(user_sentence)
-        user_words = user_sentence.split()
-        
+
+        results_heap: List[Tuple[float, int, AutoCompleteData]] = []
+        user_words = self.preprocess_sentence_words(user_sentence)
+        user_sentence = ' '.join(user_words)
+
         if not user_words:
             return []
-        
-        for index, row in sentences_df.iterrows():
+
+        # Each candidate is scored independently, so large candidate sets
+        # are split across worker processes. Only the raw sentences cross
+        # the process boundary: shipping the cached token lists would cost
+        # more in pickling than the workers save by not re-tokenizing.
+        if len(sentences) >= _PARALLEL_MIN_SENTENCES:
+            executor = _get_executor()
+            workers = os.cpu_count() or 1
+            chunk_size = (len(sentences) + workers - 1) // workers
+            futures = [
+                executor.submit(_score_chunk, user_sentence, sentences[start:start + chunk_size], start)
+                for start in range(0, len(sentences), chunk_size)
+            ]
+            for future in futures:
+                for candidate_index, score_data in future.result():
+                    self.update_results_list(results_heap, score_data, candidate_index)
+
+            results_heap.sort(key=lambda entry: (-entry[0], entry[1]))
+            return [entry[2] for entry in results_heap]
+
+        corpus_words = self._corpus_words if sentence_ids is not None else None
+        corpus_positions = self._corpus_positions if sentence_ids is not None else None
+
+        for index, sentence in enumerate(sentences):
+            if corpus_words is not None:
+                row_id = sentence_ids[index]
+                processed_words = corpus_words[row_id]
+                word_positions = corpus_positions[row_id]
+            else:
+                processed_words = None
+                word_positions = None
             try:
                 score_data = self._calculate_single_sentence_score(
-                    user_words, row['sentence'], user_sentence
+                    user_words, sentence, user_sentence, processed_words, word_positions
                 )
                 if score_data:
-                    autocomplete_results.append(score_data)
+                    self.update_results_list(results_heap, score_data, index)
             except Exception as e:
                 logging.error(f"Error calculating score for sentence {index}: {e}")
                 continue
-        
-        # Sort by descending score and take the best
-        autocomplete_results.sort(key=lambda x: x.score, reverse=True)
-        return autocomplete_results[:5]
+
+        # Extract the kept results in descending score order
+        results_heap.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [entry[2] for entry in results_heap]
     
-    def _calculate_single_sentence_score(self, user_words: List[str], 
-                                       sentence: str, user_sentence: str) -> Optional[AutoCompleteData]:
+    def _calculate_single_sentence_score(self, user_words: List[str],
+                                       sentence: str, user_sentence: str,
+                                       processed_words: Optional[List[str]] = None,
+                                       word_positions: Optional[Dict[str, List[int]]] = None) -> Optional[AutoCompleteData]:
         """
         Calculates score for a single sentence
-        
+
         Args:
             user_words: User's words
             sentence: Candidate sentence
             user_sentence: Complete user sentence
-            
+            processed_words: Pre-tokenized sentence words (from index_corpus),
+                tokenized on the fly when not provided
+            word_positions: Precomputed word -> positions map for the
+                sentence, built on the fly when not provided
+
         Returns:
             Autocomplete data with calculated score
         """
@@ -372,28 +686,42 @@ class ScoreCalculator:
         score = 0.0
         one_change_found = False
         offset = 0
-        
-        processed_sentence = self.preprocess_sentence(sentence)
-        processed_sentence_words = processed_sentence.split()
-        
-        for word in user_words:
-            if word in processed_sentence_words[position:]:
-                # Word found exactly
-                score = self.increment_score(score, word)
-                position = processed_sentence_words.index(word, position)
-                if user_words.index(word) == 0:
-                    offset = position + 1
-            elif not one_change_found:
+
+        if processed_words is None:
+            processed_words = self.preprocess_sentence_words(sentence)
+        if word_positions is None:
+            word_positions = self._build_word_positions(processed_words)
+        processed_sentence_words = processed_words
+
+        for word_index, word in enumerate(user_words):
+            # Binary-search the first occurrence at or after `position`
+            # instead of scanning (and slicing) the word list
+            matched = False
+            positions = word_positions.get(word)
+            if positions is not None:
+                occurrence = bisect_left(positions, position)
+                if occurrence < len(positions):
+                    score = self.increment_score(score, word)
+                    position = positions[occurrence]
+                    if word_index == 0:
+                        offset = position + 1
+                    matched = True
+
+            if matched:
+                continue
+
+            if not one_change_found:
                 # Search for word variations
-                for i, sentence_word in enumerate(processed_sentence_words[position:], position):
-                    change_type = self.calculate_change_type(word, sentence_word)
-                    if change_type:
-                        score = self.penalty_score(
-                            processed_sentence_words, sentence_word, word, score, change_type
-                        )
-                        one_change_found = True
-                        position = i
-                        break
+                match_index, change_type = self._find_one_change(
+                    word, processed_sentence_words, position
+                )
+                if change_type:
+                    sentence_word = processed_sentence_words[match_index]
+                    score = self.penalty_score(
+                        match_index, word, sentence_word, score, change_type
+                    )
+                    one_change_found = True
+                    position = match_index
                 else:
                     # No match found
                     score = float('-inf')
@@ -425,9 +753,15 @@ def preprocess_sentence(sentence: str) -> str:
     return _score_calculator.preprocess_sentence(sentence)
 
 
-def calculate_scores(user_sentence: str, sentences_df) -> List[AutoCompleteData]:
+def calculate_scores(user_sentence: str, sentences: List[str],
+                     sentence_ids=None) -> List[AutoCompleteData]:
     """Convenience function to calculate scores"""
-    return _score_calculator.calculate_scores(user_sentence, sentences_df)
+    return _score_calculator.calculate_scores(user_sentence, sentences, sentence_ids)
+
+
+def index_corpus(sentences: List[str]) -> None:
+    """Convenience function to precompute tokenized corpus sentences"""
+    _score_calculator.index_corpus(sentences)
 
 
 # Constants for compatibility with existing code
@@ -10,26 +10,34 @@ Author: Team 3
 Date: 2024
 """
 
-import pandas as pd
+import mmap
+import numpy as np
 import os
+import re
 import time
 import logging
 import cProfile
 import pstats
 import io
 import psutil
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 from Trie import Trie
-from calculate_score import calculate_scores, preprocess_sentence
+from calculate_score import calculate_scores, index_corpus, preprocess_sentence
 
 # Configuration constants
 DATA_DIR = "/Archive"
-ENGLISH_LETTERS_NUM = 26
 MAX_RESULTS = 5
 MIN_WORD_LENGTH = 2
 
+# Bound methods of compiled patterns: scan in C, stop at the first letter
+_HAS_ALPHA = re.compile(r'[A-Za-z]').search
+_HAS_ALPHA_BYTES = re.compile(rb'[A-Za-z]').search
+
 # Logging configuration
 CURR_DIR = os.path.dirname(os.path.realpath(__file__))
 LOGS_DIR = os.path.join(CURR_DIR, "logs")
@@ -42,6 +50,44 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+def parse_file(file_path: str) -> List[Tuple[str, List[str]]]:
+    """
+    Parses one data file into (line, words) pairs
+
+    Runs inside process-pool workers during loading, so it lives at
+    module level (picklable) and does its own line filtering; each
+    worker logs errors to the shared log file.
+
+    Args:
+        file_path: Path of the .txt file to parse
+
+    Returns:
+        List of (stripped line, split words) pairs for lines with words
+    """
+    parsed: List[Tuple[str, List[str]]] = []
+    try:
+        # Memory-map the file: the OS pages data in lazily and lines
+        # without letters are skipped at the bytes level, before any
+        # UTF-8 decode
+        with open(file_path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return parsed  # empty file
+            try:
+                for raw in iter(mm.readline, b''):
+                    if _HAS_ALPHA_BYTES(raw) is None:
+                        continue
+                    line = raw.decode('utf-8', errors='ignore').strip()
+                    if line:
+                        parsed.append((line, line.split()))
+            finally:
+                mm.close()
+    except Exception as e:
+        logging.error(f"Error processing file {file_path}: {e}")
+    return parsed
+
+
 @dataclass
 class SearchResult:
     """Class to represent a search result"""
@@ -52,22 +98,43 @@ class SearchResult:
 
 
 class AutoCompleteSystem:
-    """Main autocomplete system"""
-    
+    """
+    Main autocomplete system
+
+    Sentences are stored as parallel arrays instead of a DataFrame: a
+    plain list of sentence strings plus a uint32 file id per sentence
+    that indexes an interned file-path table. Queries then touch only
+    the rows they match rather than masking the whole table.
+    """
+
     def __init__(self):
-        self.sentences_df = pd.DataFrame(columns=['sentence', 'file_path'])
+        self._proc = psutil.Process()
+        self._sentences: List[str] = []
+        self._file_ids = array('I')
+        self._file_paths: List[str] = []
+        self._file_path_to_id: Dict[str, int] = {}
         self.words_trie = Trie()
         self.is_initialized = False
+        # Per-instance LRU caches: interactive use re-issues the same
+        # input on almost every keystroke, so exact repeats are O(1)
+        self._search_matches_cached = lru_cache(maxsize=256)(self._search_matches_uncached)
+        self._suggestions_cached = lru_cache(maxsize=128)(self._get_suggestions_uncached)
+        # Word-level caches shared across keystrokes: extending the input
+        # re-queries every completed word, so their trie lookups repeat
+        # while only the word being typed changes
+        self._word_sentences_cached = lru_cache(maxsize=1024)(
+            self.words_trie.get_sentences_of_word
+        )
+        self._fuzzy_collect_cached = lru_cache(maxsize=512)(self.words_trie.fuzzy_collect)
         
     def monitor_memory_usage(self) -> float:
         """Monitors memory usage of the process"""
-        process = psutil.Process()
-        memory_info = process.memory_info()
+        memory_info = self._proc.memory_info()
         rss_mb = memory_info.rss / (1024 * 1024)
         logging.info(f"Memory Usage - RSS: {rss_mb:.2f} MB")
         return rss_mb
     
-    def timeit(self, func):
+    def timeit(func):
         """Decorator to measure function execution time"""
         def wrapper(*args, **kwargs):
             start_time = time.time()
@@ -81,13 +148,11 @@ class AutoCompleteSystem:
     
     def initialize_words_trie(self, line: str, sentence_id: int) -> None:
         """Initializes Trie with words from a sentence"""
-        words = line.split()
-        for position, word in enumerate(words):
-            self.words_trie.insert(word, sentence_id, position)
+        self.words_trie.insert_sentence(line.split(), sentence_id)
     
     def contains_words(self, line: str) -> bool:
         """Checks if a line contains words"""
-        return any(c.isalpha() for c in line)
+        return _HAS_ALPHA(line) is not None
     
     def load_data_files(self) -> None:
         """Loads data files and prepares data structures"""
@@ -98,172 +163,201 @@ class AutoCompleteSystem:
         
         directory = CURR_DIR + DATA_DIR
         sentence_id = 1
-        sentences = []
-        
+
+        self._sentences = []
+        self._file_ids = array('I')
+        self._file_paths = []
+        self._file_path_to_id = {}
+
         if not os.path.exists(directory):
             raise FileNotFoundError(f"Data directory not found: {directory}")
-        
-        # Walk through directory and process files
+
+        # Collect file paths, then parse files in parallel: parsing is
+        # CPU-bound and independent per file, so workers split + filter
+        # lines while the main process only merges results into the Trie
+        file_names: List[str] = []
+        file_paths: List[str] = []
         for subdir, dirs, files in os.walk(directory):
             for file in files:
                 if file.endswith('.txt'):
-                    file_path = os.path.join(subdir, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as txt_file:
-                            content = txt_file.read()
-                            lines = content.split('\n')
-                            
-                            for line in lines:
-                                line = line.strip()
-                                if self.contains_words(line) and len(line) > 0:
-                                    sentences.append([line, file])
-                                    self.initialize_words_trie(line, sentence_id)
-                                    sentence_id += 1
-                                    
-                    except Exception as e:
-                        logging.error(f"Error processing file {file_path}: {e}")
-                        continue
-        
-        self.sentences_df = pd.DataFrame(sentences, columns=['sentence', 'file_path'])
+                    file_names.append(file)
+                    file_paths.append(os.path.join(subdir, file))
+
+        with ProcessPoolExecutor() as executor:
+            for file, parsed in zip(file_names,
+                                    executor.map(parse_file, file_paths, chunksize=4)):
+                # Intern the file name: each sentence row stores only
+                # a small integer id into the file-path table
+                file_id = self._file_path_to_id.setdefault(file, len(self._file_paths))
+                if file_id == len(self._file_paths):
+                    self._file_paths.append(file)
+
+                # Extend the columnar arrays once per file: a single
+                # resize per batch instead of per-line append growth
+                self._sentences.extend(line for line, _ in parsed)
+                self._file_ids.extend([file_id] * len(parsed))
+                for _, words in parsed:
+                    self.words_trie.insert_sentence(words, sentence_id)
+                    sentence_id += 1
+
+        self.words_trie.shrink_to_fit()
+        index_corpus(self._sentences)
+        # Cached query results refer to the previous corpus
+        self._search_matches_cached.cache_clear()
+        self._suggestions_cached.cache_clear()
+        self._word_sentences_cached.cache_clear()
+        self._fuzzy_collect_cached.cache_clear()
         self.is_initialized = True
-        
-        print(f"✅ System initialized with {len(sentences)} sentences")
-        logging.info(f"System initialized with {len(sentences)} sentences")
+
+        print(f"✅ System initialized with {len(self._sentences)} sentences")
+        logging.info(f"System initialized with {len(self._sentences)} sentences")
         self.monitor_memory_usage()
     
     def filter_sentences_for_short_input(self, input_string: str) -> List[int]:
         """Filters sentences for short inputs (less than 2 words)"""
         input_string = preprocess_sentence(input_string)
         words = input_string.split()
-        all_sentence_ids = set()
-        
+        common_ids: Optional[np.ndarray] = None
+
         for word in words:
-            word_sentence_ids = set()
-            original_match_sentences = self.words_trie.get_sentences_of_word(word) or {}
-            word_sentence_ids.update(original_match_sentences.keys())
-            
-            # Generate word variations (edit distance 1)
-            for i in range(len(word)):
-                for char_num in range(ENGLISH_LETTERS_NUM):
-                    # Add character
-                    add_char_before = word[:i] + chr(ord('a') + char_num) + word[i:]
-                    # Change character
-                    change_char = word[:i] + chr(ord('a') + char_num) + word[i + 1:]
-                    # Remove character
-                    remove_char = word[:i] + word[i + 1:]
-                    
-                    # Search variations in Trie
-                    for variation in [add_char_before, change_char, remove_char]:
-                        match_sentences = self.words_trie.get_sentences_of_word(variation) or {}
-                        word_sentence_ids.update(match_sentences.keys())
-            
-            # Add character at the end
-            for char_num in range(ENGLISH_LETTERS_NUM):
-                add_char_end = word + chr(ord('a') + char_num)
-                match_sentences_end = self.words_trie.get_sentences_of_word(add_char_end) or {}
-                word_sentence_ids.update(match_sentences_end.keys())
-            
-            if not all_sentence_ids:
-                all_sentence_ids = word_sentence_ids
+            # One pruned Trie walk covers the word and every variation
+            # within edit distance 1, instead of enumerating candidates
+            match_sentences = self._fuzzy_collect_cached(word, 1)
+            if not match_sentences:
+                return []
+
+            word_ids = np.fromiter(
+                match_sentences.keys(), dtype=np.uint32, count=len(match_sentences)
+            )
+            word_ids.sort()
+
+            if common_ids is None:
+                common_ids = word_ids
             else:
-                all_sentence_ids = all_sentence_ids.intersection(word_sentence_ids)
-        
-        return [index - 1 for index in all_sentence_ids]
+                # Both sides are sorted and unique: merge-style intersection
+                common_ids = np.intersect1d(common_ids, word_ids, assume_unique=True)
+                if common_ids.size == 0:
+                    return []
+
+        if common_ids is None:
+            return []
+        return (common_ids.astype(np.intp) - 1).tolist()
     
     @timeit
-    def search_matches(self, user_input: str) -> pd.DataFrame:
+    def search_matches(self, user_input: str) -> np.ndarray:
         """
         Searches for sentences that match user input
-        
+
         Args:
             user_input: User input text
-            
+
         Returns:
-            DataFrame with matching sentences
+            Array of matching sentence indexes (0-based)
         """
         if not self.is_initialized:
             raise RuntimeError("System has not been initialized")
-        
+
         user_input = user_input.lower().strip()
         if not user_input:
-            return pd.DataFrame(columns=['sentence', 'file_path'])
-        
+            return np.empty(0, dtype=np.intp)
+
+        indexes = self._search_matches_cached(user_input)
+        return np.asarray(indexes, dtype=np.intp)
+
+    def _search_matches_uncached(self, user_input: str) -> Tuple[int, ...]:
+        """
+        Match computation behind the search cache
+
+        Args:
+            user_input: Normalized (lowercased, stripped) input text
+
+        Returns:
+            Sorted tuple of matching sentence indexes (0-based); a tuple
+            so that cached results are hashable and immutable
+        """
         words = user_input.split()
         
         if len(words) >= MIN_WORD_LENGTH:
-            # Search for long inputs
-            match_sentences = {}
-            
-            for word_index, word in enumerate(words):
-                sentences_that_word_appears = self.words_trie.get_sentences_of_word(word)
-                if sentences_that_word_appears:
-                    for sentence_id, positions in sentences_that_word_appears.items():
-                        if word_index == 0:
-                            match_sentences[sentence_id] = 1
-                        elif word_index == 1:
-                            match_sentences[sentence_id] = match_sentences.get(sentence_id, 0) + 1
-                        else:
-                            if match_sentences.get(sentence_id, 0) is None:
-                                match_sentences[sentence_id] = None
-                            elif match_sentences.get(sentence_id, 0) >= word_index - 1:
-                                match_sentences[sentence_id] += 1
-                            else:
-                                match_sentences[sentence_id] = None
-            
-            # Filter valid results
-            matching_sentence_ids = [
-                key - 1 for key, value in match_sentences.items() 
-                if value is not None and value >= len(words) - 1
-            ]
+            # Search for long inputs: keep sentences containing all query
+            # words except at most one. Counting occurrences across the
+            # per-word id arrays with np.unique replaces the old per-id
+            # dict state machine with one vectorized pass.
+            id_arrays = []
+            missing_words = 0
+            for word in words:
+                sentences_that_word_appears = self._word_sentences_cached(word)
+                if not sentences_that_word_appears:
+                    # Two absent words already rule out every sentence:
+                    # no remaining lookup can change the outcome
+                    missing_words += 1
+                    if missing_words >= 2:
+                        return ()
+                    continue
+                id_arrays.append(np.fromiter(
+                    sentences_that_word_appears.keys(),
+                    dtype=np.int64,
+                    count=len(sentences_that_word_appears),
+                ))
+
+            if id_arrays:
+                ids, counts = np.unique(np.concatenate(id_arrays), return_counts=True)
+                matching_sentence_ids = (ids[counts >= len(words) - 1] - 1).tolist()
+            else:
+                matching_sentence_ids = []
         else:
             # Search for short inputs
             matching_sentence_ids = self.filter_sentences_for_short_input(user_input)
         
-        # Get sentences from DataFrame
-        if matching_sentence_ids:
-            filtered_df = self.sentences_df[self.sentences_df.index.isin(matching_sentence_ids)].copy()
-            filtered_df.columns = ['sentence', 'file_path']
-        else:
-            filtered_df = pd.DataFrame(columns=['sentence', 'file_path'])
-        
-        self.monitor_memory_usage()
-        return filtered_df
+        return tuple(sorted(matching_sentence_ids))
     
     def get_autocomplete_suggestions(self, user_input: str) -> List[SearchResult]:
         """
         Gets autocomplete suggestions for user input
-        
+
         Args:
             user_input: User input text
-            
+
         Returns:
             List of autocomplete results ordered by score
         """
+        return list(self._suggestions_cached(user_input))
+
+    def _get_suggestions_uncached(self, user_input: str) -> Tuple[SearchResult, ...]:
+        """Suggestion computation behind the suggestion cache"""
         try:
-            filtered_df = self.search_matches(user_input)
-            
-            if filtered_df.empty:
-                return []
-            
+            matching_indexes = self.search_matches(user_input)
+
+            if len(matching_indexes) == 0:
+                return ()
+
             # Calculate scores and get top results
-            top_results = calculate_scores(user_input, filtered_df)
-            
+            candidates = [self._sentences[index] for index in matching_indexes]
+            top_results = calculate_scores(user_input, candidates, matching_indexes)
+
+            # Map each suggested sentence back to its corpus row (first
+            # occurrence wins for sentences repeated across files)
+            sentence_to_row: Dict[str, int] = {}
+            for index in matching_indexes:
+                sentence_to_row.setdefault(self._sentences[index], index)
+
             # Convert to SearchResult objects
             search_results = []
             for idx, result in enumerate(top_results, start=1):
+                row = sentence_to_row.get(result.source_text)
+                file_path = self._file_paths[self._file_ids[row]] if row is not None else "N/A"
                 search_result = SearchResult(
                     sentence=result.source_text,
-                    file_path=filtered_df.iloc[result.offset - 1]['file_path'] if result.offset > 0 else "N/A",
+                    file_path=file_path,
                     score=result.score,
                     rank=idx
                 )
                 search_results.append(search_result)
-            
-            return search_results
-            
+
+            return tuple(search_results)
+
         except Exception as e:
             logging.error(f"Error in autocomplete search: {e}")
-            return []
+            return ()
     
     def display_results(self, results: List[SearchResult]) -> None:
         """Displays autocomplete results elegantly"""
@@ -285,19 +379,22 @@ def main():
     """Main program function"""
     print("🚀 Intelligent Autocomplete System")
     print("=" * 50)
-    
-    # Configure profiling
-    profiler = cProfile.Profile()
-    profiler.enable()
-    
+
+    # Profiling is opt-in: cProfile slows every Python call, so normal
+    # runs skip it unless AUTOCOMPLETE_PROFILE is set
+    profiler = None
+    if os.environ.get("AUTOCOMPLETE_PROFILE"):
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     try:
         # Initialize system
         system = AutoCompleteSystem()
         system.load_data_files()
         
         print(f"\n📊 System Statistics:")
-        print(f"   • Total sentences loaded: {len(system.sentences_df):,}")
-        print(f"   • Files processed: {system.sentences_df['file_path'].nunique()}")
+        print(f"   • Total sentences loaded: {len(system._sentences):,}")
+        print(f"   • Files processed: {len(system._file_paths)}")
         print(f"   • Memory used: {system.monitor_memory_usage():.2f} MB")
         
         # Main interaction loop
@@ -338,12 +435,13 @@ def main():
         print(f"❌ Fatal error: {e}")
     
     finally:
-        # Disable profiling and show statistics
-        profiler.disable()
-        stats_buffer = io.StringIO()
-        stats = pstats.Stats(profiler, stream=stats_buffer).sort_stats('cumulative')
-        stats.print_stats(20)  # Top 20 functions
-        logging.info("Application profiling completed")
+        if profiler is not None:
+            # Disable profiling and show statistics
+            profiler.disable()
+            stats_buffer = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stats_buffer).sort_stats('cumulative')
+            stats.print_stats(20)  # Top 20 functions
+            logging.info("Application profiling completed")
 
 
 if __name__ == "__main__":
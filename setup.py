@@ -245,6 +245,7 @@ def show_usage_instructions():
     print("\n🔧 Configuration:")
     print("   • Edit config.yaml to customize the system")
     print("   • Add .txt files to the Archive/ directory")
+    print("   • Set AUTOCOMPLETE_PROFILE=1 to enable cProfile runs")
     
     print("\n📞 Support:")
     print("   • Check logs/application.log for errors")
@@ -10,19 +10,49 @@ Date: 2024
 """
 
 import os
+import pickle
+import platform
+import re
+import string
 import sys
 import time
 import psutil
 import logging
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 from pathlib import Path
 import yaml
 from datetime import datetime
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml bindings not built
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    from xxhash import xxh3_128_hexdigest as _content_hash
+except ImportError:
+    import hashlib
+
+    def _content_hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Facts that cannot change while the process runs, captured once
+_CPU_COUNT = psutil.cpu_count()
+_MEMORY_TOTAL = psutil.virtual_memory().total
+_PLATFORM_INFO = {
+    'platform': platform.system(),
+    'platform_version': platform.version(),
+    'architecture': platform.architecture()[0],
+    'processor': platform.processor(),
+    'python_version': platform.python_version(),
+}
+
 
 class SystemUtils:
     """System utilities"""
-    
+
     @staticmethod
     def get_system_info() -> Dict[str, Any]:
         """
@@ -34,8 +64,8 @@ class SystemUtils:
         return {
             'platform': sys.platform,
             'python_version': sys.version,
-            'cpu_count': psutil.cpu_count(),
-            'memory_total': psutil.virtual_memory().total,
+            'cpu_count': _CPU_COUNT,
+            'memory_total': _MEMORY_TOTAL,
             'memory_available': psutil.virtual_memory().available,
             'disk_usage': psutil.disk_usage('/').percent
         }
@@ -78,6 +108,10 @@ class ConfigManager:
             config_path: Path to configuration file
         """
         self.config_path = config_path
+        # Resolved dotted keys are cached per generation; set() and
+        # reloads bump the generation, which keys them out of the cache
+        self._cache_generation = 0
+        self._resolve = lru_cache(maxsize=128)(self._resolve_uncached)
         self.config = self._load_config()
     
     def _load_config(self) -> Dict[str, Any]:
@@ -89,8 +123,32 @@ class ConfigManager:
         """
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r', encoding='utf-8') as file:
-                    return yaml.safe_load(file)
+                with open(self.config_path, 'rb') as file:
+                    raw = file.read()
+                # Key the cache by content hash rather than mtime:
+                # hashing is orders of magnitude faster than YAML
+                # parsing and does not miss same-second edits
+                digest = _content_hash(raw)
+                cache_path = self.config_path + '.cache'
+
+                # Reuse the pickled parse when the YAML file is unchanged:
+                # unpickling a small dict is far cheaper than YAML parsing
+                try:
+                    with open(cache_path, 'rb') as cache_file:
+                        cached_digest, config = pickle.load(cache_file)
+                    if cached_digest == digest:
+                        return config
+                except (OSError, pickle.PickleError, EOFError, ValueError):
+                    pass
+
+                config = yaml.load(raw, Loader=_YamlLoader)
+
+                try:
+                    with open(cache_path, 'wb') as cache_file:
+                        pickle.dump((digest, config), cache_file)
+                except OSError:
+                    pass  # cache is best-effort; read-only dirs are fine
+                return config
             else:
                 logging.warning(f"Configuration file not found: {self.config_path}")
                 return self._get_default_config()
@@ -130,9 +188,16 @@ class ConfigManager:
         Returns:
             Configuration value
         """
+        try:
+            return self._resolve(self._cache_generation, key, default)
+        except TypeError:  # unhashable default bypasses the cache
+            return self._resolve_uncached(self._cache_generation, key, default)
+
+    def _resolve_uncached(self, generation: int, key: str, default: Any) -> Any:
+        """Dotted-key walk behind the lookup cache"""
         keys = key.split('.')
         value = self.config
-        
+
         try:
             for k in keys:
                 value = value[k]
@@ -157,7 +222,8 @@ class ConfigManager:
             config = config[k]
         
         config[keys[-1]] = value
-    
+        self._cache_generation += 1
+
     def save(self) -> None:
         """Saves configuration to file"""
         try:
@@ -167,30 +233,83 @@ class ConfigManager:
             logging.error(f"Error saving configuration: {e}")
 
 
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value: int) -> int:
+        return bin(value).count('1')
+
+# Sentence terminators folded to one character, so splitting needs no
+# regex engine at all
+_TERMINATOR_TABLE = str.maketrans('!?', '..')
+# Anything split/join would actually change: edge or doubled whitespace,
+# or whitespace that is not a plain space
+_NEEDS_SPACE_NORMALIZE = re.compile(r'^\s|\s\s|\s$|[^\S ]').search
+
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
+
+# Deletion table of the allowed input characters: translating a valid
+# input through it leaves nothing behind
+_ALLOWED_CHARS_TABLE = str.maketrans(
+    '', '', string.ascii_letters + string.digits + string.whitespace + '.,!?-'
+)
+
+# Token -> bit index table shared by bitset similarity, grown lazily
+_similarity_vocab: Dict[str, int] = {}
+
+
+def _to_bitset(tokens: List[str]) -> int:
+    """
+    Encodes tokens as a bitset over the shared token vocabulary
+
+    Args:
+        tokens: Lowercased tokens to encode
+
+    Returns:
+        Integer with one bit set per distinct token
+    """
+    vocab = _similarity_vocab
+    bits = 0
+    for token in tokens:
+        index = vocab.get(token)
+        if index is None:
+            index = len(vocab)
+            vocab[token] = index
+        bits |= 1 << index
+    return bits
+
+
 class TextUtils:
     """Text processing utilities"""
-    
+
     @staticmethod
+    @lru_cache(maxsize=4096)
     def clean_text(text: str) -> str:
         """
         Cleans and normalizes text
-        
+
+        Results are memoized: interactive callers clean the same input
+        on consecutive keystrokes, and repeats cost one cache probe.
+
         Args:
             text: Text to clean
-            
+
         Returns:
             Clean and normalized text
         """
         if not text:
             return ""
-        
+
         # Convert to lowercase
         text = text.lower()
-        
+
+        # Fast path: already space-normalized text skips the split/join
+        # round trip; one C regex scan decides
+        if _NEEDS_SPACE_NORMALIZE(text) is None:
+            return text
+
         # Normalize spaces
-        text = ' '.join(text.split())
-        
-        return text
+        return ' '.join(text.split())
     
     @staticmethod
     def split_sentences(text: str) -> List[str]:
@@ -203,43 +322,107 @@ class TextUtils:
         Returns:
             List of sentences
         """
-        import re
-        
-        # Pattern to split sentences
-        sentence_pattern = r'[.!?]+'
-        sentences = re.split(sentence_pattern, text)
-        
+        # Fold ! and ? into . and split on that; empty pieces (from
+        # terminator runs) are filtered with the blanks below
+        parts = text.translate(_TERMINATOR_TABLE).split('.')
+
         # Clean and filter empty sentences
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
+        sentences = [s.strip() for s in parts if s.strip()]
+
         return sentences
     
     @staticmethod
-    def calculate_similarity(text1: str, text2: str) -> float:
+    def calculate_similarity(text1: str, text2: str, threshold: float = 0.0) -> float:
         """
         Calculates similarity between two texts
-        
+
         Args:
             text1: First text
             text2: Second text
-            
+            threshold: Minimum similarity of interest; pairs whose token
+                counts make this unreachable return 0.0 without any
+                set/bitset work
+
         Returns:
             Similarity value between 0 and 1
         """
         if not text1 or not text2:
             return 0.0
-        
-        # Convert to word sets
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
+
+        tokens1 = text1.lower().split()
+        tokens2 = text2.lower().split()
+
+        if not tokens1 or not tokens2:
             return 0.0
-        
-        # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
+
+        # Length filter: Jaccard can never reach the threshold when the
+        # smaller text is too short relative to the larger one
+        if threshold > 0:
+            n1, n2 = len(tokens1), len(tokens2)
+            if min(n1, n2) < threshold * max(n1, n2):
+                return 0.0
+
+        # Encode both texts as bitsets over the shared vocabulary:
+        # Jaccard becomes two bitwise ops plus popcounts, with no
+        # per-call set allocation or token re-hashing beyond the
+        # vocabulary lookup
+        bits1 = _to_bitset(tokens1)
+        bits2 = _to_bitset(tokens2)
+
+        intersection = _popcount(bits1 & bits2)
+        union = _popcount(bits1) + _popcount(bits2) - intersection
+
+        return intersection / union if union > 0 else 0.0
+
+    @staticmethod
+    def prepare_tokens(text: str) -> Tuple[int, int]:
+        """
+        Precomputes the similarity encoding of a text
+
+        Scoring loops that compare one query against many candidates
+        should prepare each side once and use
+        `calculate_similarity_prepared`, so per-pair cost drops to a few
+        bitwise operations.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Tuple of (token bitset, token count)
+        """
+        if not text:
+            return (0, 0)
+        tokens = text.lower().split()
+        return (_to_bitset(tokens), len(tokens))
+
+    @staticmethod
+    def calculate_similarity_prepared(prepared1: Tuple[int, int],
+                                      prepared2: Tuple[int, int],
+                                      threshold: float = 0.0) -> float:
+        """
+        Calculates similarity between two prepared encodings
+
+        Args:
+            prepared1: First (bitset, token count) from `prepare_tokens`
+            prepared2: Second (bitset, token count) from `prepare_tokens`
+            threshold: Minimum similarity of interest for the length
+                filter, as in `calculate_similarity`
+
+        Returns:
+            Similarity value between 0 and 1
+        """
+        bits1, n1 = prepared1
+        bits2, n2 = prepared2
+
+        if not bits1 or not bits2:
+            return 0.0
+
+        if threshold > 0 and min(n1, n2) < threshold * max(n1, n2):
+            return 0.0
+
+        intersection = _popcount(bits1 & bits2)
+        union = _popcount(bits1) + _popcount(bits2) - intersection
+
         return intersection / union if union > 0 else 0.0
 
     @staticmethod
@@ -264,9 +447,10 @@ class TextUtils:
         if len(text) > max_length:
             return False, f"Input cannot exceed {max_length} characters"
         
-        # Check for valid characters (letters, numbers, spaces, basic punctuation)
-        import re
-        if not re.match(r'^[a-zA-Z0-9\s.,!?-]+$', text):
+        # Check for valid characters (letters, numbers, spaces, basic
+        # punctuation): deleting every allowed character must consume
+        # the whole string
+        if text.translate(_ALLOWED_CHARS_TABLE):
             return False, "Input contains invalid characters"
         
         return True, ""
@@ -284,13 +468,12 @@ class TextUtils:
         """
         if size_bytes == 0:
             return "0 B"
-        
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        import math
-        i = int(math.floor(math.log(size_bytes, 1024)))
-        p = math.pow(1024, i)
-        s = round(size_bytes / p, 2)
-        return f"{s} {size_names[i]}"
+
+        # The unit index is just the number of whole 1024-steps, i.e.
+        # bit_length // 10 — no float log/pow needed
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
+        s = round(size_bytes / (1 << (10 * i)), 2)
+        return f"{s} {_SIZE_NAMES[i]}"
     
     @staticmethod
     def get_system_stats() -> Dict[str, Any]:
@@ -300,22 +483,21 @@ class TextUtils:
         Returns:
             Dictionary with system statistics
         """
-        import platform
-        
-        return {
-            'platform': platform.system(),
-            'platform_version': platform.version(),
-            'architecture': platform.architecture()[0],
-            'processor': platform.processor(),
-            'python_version': platform.python_version(),
-            'cpu_count': psutil.cpu_count(),
-            'cpu_percent': psutil.cpu_percent(interval=1),
-            'memory_total': psutil.virtual_memory().total,
-            'memory_available': psutil.virtual_memory().available,
-            'memory_percent': psutil.virtual_memory().percent,
-            'disk_usage': psutil.disk_usage('/').percent,
-            'disk_free': psutil.disk_usage('/').free
-        }
+        virtual_memory = psutil.virtual_memory()
+        disk_usage = psutil.disk_usage('/')
+
+        stats = dict(_PLATFORM_INFO)
+        stats.update({
+            'cpu_count': _CPU_COUNT,
+            # interval=None samples since the last call, without blocking
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_total': _MEMORY_TOTAL,
+            'memory_available': virtual_memory.available,
+            'memory_percent': virtual_memory.percent,
+            'disk_usage': disk_usage.percent,
+            'disk_free': disk_usage.free
+        })
+        return stats
 
 
 class FileUtils:
@@ -326,9 +508,13 @@ class FileUtils:
         """
         Gets file information
         
+        Timestamps are returned as raw floats; constructing datetime
+        objects per file is needless work in bulk listings, so callers
+        that display them use `ts_to_datetime`.
+
         Args:
             file_path: File path
-            
+
         Returns:
             Dictionary with file information
         """
@@ -336,38 +522,106 @@ class FileUtils:
             stat = os.stat(file_path)
             return {
                 'size': stat.st_size,
-                'modified': datetime.fromtimestamp(stat.st_mtime),
-                'created': datetime.fromtimestamp(stat.st_ctime),
+                'modified_ts': stat.st_mtime,
+                'created_ts': stat.st_ctime,
                 'extension': Path(file_path).suffix,
                 'name': Path(file_path).name
             }
         except Exception as e:
             logging.error(f"Error getting file information for {file_path}: {e}")
             return {}
+
+    @staticmethod
+    def ts_to_datetime(timestamp: float) -> datetime:
+        """
+        Converts a raw file timestamp to a datetime
+
+        Args:
+            timestamp: Timestamp as returned in `get_file_info`
+
+        Returns:
+            Corresponding local datetime
+        """
+        return datetime.fromtimestamp(timestamp)
     
+    @staticmethod
+    def scan_files_by_extension(directory: str, extensions: List[str]) -> List[os.DirEntry]:
+        """
+        Gets directory entries for files by extension
+
+        Returns os.DirEntry objects rather than paths: entry.stat()
+        reuses metadata gathered during the walk, so pipelines that
+        also want file info (see `info_from_entry`) avoid a second
+        stat call per file.
+
+        Args:
+            directory: Directory to search
+            extensions: List of extensions to search for
+
+        Returns:
+            List of directory entries
+        """
+        ext_tuple = tuple(extensions)
+
+        def _walk(current: str):
+            # scandir surfaces the entry type from the directory read
+            # itself, so no per-file stat; endswith takes the whole
+            # extension tuple in one C call
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from _walk(entry.path)
+                    elif entry.name.endswith(ext_tuple):
+                        yield entry
+
+        try:
+            return list(_walk(directory))
+        except Exception as e:
+            logging.error(f"Error searching files in {directory}: {e}")
+            return []
+
     @staticmethod
     def get_files_by_extension(directory: str, extensions: List[str]) -> List[str]:
         """
         Gets files by extension
-        
+
         Args:
             directory: Directory to search
             extensions: List of extensions to search for
-            
+
         Returns:
             List of file paths
         """
-        files = []
-        
+        return [entry.path
+                for entry in FileUtils.scan_files_by_extension(directory, extensions)]
+
+    @staticmethod
+    def info_from_entry(entry: os.DirEntry) -> Dict[str, Any]:
+        """
+        Gets file information from a directory entry
+
+        Same shape as `get_file_info`, but entry.stat() serves the
+        metadata cached by the scandir walk instead of issuing a fresh
+        stat call.
+
+        Args:
+            entry: Directory entry from `scan_files_by_extension`
+
+        Returns:
+            Dictionary with file information
+        """
         try:
-            for root, dirs, filenames in os.walk(directory):
-                for filename in filenames:
-                    if any(filename.endswith(ext) for ext in extensions):
-                        files.append(os.path.join(root, filename))
+            stat = entry.stat()
+            return {
+                'size': stat.st_size,
+                'modified_ts': stat.st_mtime,
+                'created_ts': stat.st_ctime,
+                'extension': os.path.splitext(entry.name)[1],
+                'name': entry.name
+            }
         except Exception as e:
-            logging.error(f"Error searching files in {directory}: {e}")
-        
-        return files
+            logging.error(f"Error getting file information for {entry.path}: {e}")
+            return {}
     
     @staticmethod
     def safe_read_file(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
@@ -381,20 +635,33 @@ class FileUtils:
         Returns:
             File content or None if error
         """
+        # Read the raw bytes once and try decoders against the buffer,
+        # so an encoding fallback does not re-read the file from disk
+        try:
+            with open(file_path, 'rb') as file:
+                data = file.read()
+        except Exception as e:
+            logging.error(f"Error reading file {file_path}: {e}")
+            return None
+
         try:
-            with open(file_path, 'r', encoding=encoding) as file:
-                return file.read()
+            content = data.decode(encoding)
         except UnicodeDecodeError:
             try:
                 # Try with another encoding
-                with open(file_path, 'r', encoding='latin-1') as file:
-                    return file.read()
+                content = data.decode('latin-1')
             except Exception as e:
                 logging.error(f"Error reading file {file_path}: {e}")
                 return None
-        except Exception as e:
-            logging.error(f"Error reading file {file_path}: {e}")
-            return None
+
+        # Keep the universal-newline behavior of text-mode reads
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+
+# Process handle shared by static helpers; keeps /proc descriptors open
+_SELF_PROC = psutil.Process()
 
 
 class PerformanceMonitor:
@@ -404,25 +671,28 @@ class PerformanceMonitor:
         """Initializes the performance monitor"""
         self.start_time = None
         self.memory_start = None
-    
+        self._proc = psutil.Process()
+
     def start(self) -> None:
         """Starts monitoring"""
         self.start_time = time.time()
-        self.memory_start = psutil.Process().memory_info().rss
-    
+        self.memory_start = self._proc.memory_info().rss
+
     def stop(self) -> Dict[str, float]:
         """
         Stops monitoring and returns metrics
-        
+
         Returns:
             Dictionary with performance metrics
         """
         if self.start_time is None:
             return {}
-        
+
         end_time = time.time()
-        memory_end = psutil.Process().memory_info().rss
-        
+        # oneshot batches the kernel reads behind the process queries
+        with self._proc.oneshot():
+            memory_end = self._proc.memory_info().rss
+
         return {
             'execution_time': end_time - self.start_time,
             'memory_used_mb': (memory_end - self.memory_start) / (1024 * 1024),
@@ -437,16 +707,21 @@ class PerformanceMonitor:
         Returns:
             Memory usage in MB
         """
-        return psutil.Process().memory_info().rss / (1024 * 1024)
+        return _SELF_PROC.memory_info().rss / (1024 * 1024)
+
+
+# Precomputed bar glyphs; a redraw slices this instead of rebuilding
+_BAR_LENGTH = 30
+_BAR_GLYPHS = '█' * _BAR_LENGTH + '-' * _BAR_LENGTH
 
 
 class ProgressBar:
     """Simple progress bar"""
-    
+
     def __init__(self, total: int, description: str = "Processing"):
         """
         Initializes the progress bar
-        
+
         Args:
             total: Total elements to process
             description: Process description
@@ -455,6 +730,9 @@ class ProgressBar:
         self.current = 0
         self.description = description
         self.start_time = time.time()
+        self._last_draw = 0.0
+        # Static part of every redraw, formatted once
+        self._prefix = f"\r{description}: |"
     
     def update(self, increment: int = 1) -> None:
         """
@@ -470,10 +748,17 @@ class ProgressBar:
         """Displays the progress bar"""
         if self.total == 0:
             return
-        
+
+        # Throttle terminal writes to ~20 redraws/sec; the final state
+        # is always drawn
+        now = time.monotonic()
+        if self.current != self.total and now - self._last_draw < 0.05:
+            return
+        self._last_draw = now
+
         percentage = (self.current / self.total) * 100
         elapsed_time = time.time() - self.start_time
-        
+
         # Calculate estimated remaining time
         if self.current > 0:
             estimated_total = elapsed_time * self.total / self.current
@@ -481,13 +766,16 @@ class ProgressBar:
             eta_str = f"ETA: {remaining_time:.1f}s"
         else:
             eta_str = "ETA: --"
-        
+
         # Create visual bar
-        bar_length = 30
-        filled_length = int(bar_length * self.current // self.total)
-        bar = '█' * filled_length + '-' * (bar_length - filled_length)
-        
-        print(f"\r{self.description}: |{bar}| {percentage:.1f}% ({self.current}/{self.total}) {eta_str}", end='', flush=True)
+        filled_length = int(_BAR_LENGTH * self.current // self.total)
+        bar = _BAR_GLYPHS[_BAR_LENGTH - filled_length:2 * _BAR_LENGTH - filled_length]
+
+        sys.stdout.write(
+            self._prefix + bar
+            + f"| {percentage:.1f}% ({self.current}/{self.total}) {eta_str}"
+        )
+        sys.stdout.flush()
     
     def finish(self) -> None:
         """Finishes the progress bar"""
@@ -496,6 +784,23 @@ class ProgressBar:
         print()  # New line at the end
 
 
-# Global instances for easy use
-config_manager = ConfigManager()
-performance_monitor = PerformanceMonitor() 
\ No newline at end of file
+# Shared instances, constructed lazily so importing this module does not
+# touch the config file or psutil
+_config_manager: Optional[ConfigManager] = None
+_performance_monitor: Optional[PerformanceMonitor] = None
+
+
+def get_config_manager() -> ConfigManager:
+    """Returns the shared ConfigManager, creating it on first use"""
+    global _config_manager
+    if _config_manager is None:
+        _config_manager = ConfigManager()
+    return _config_manager
+
+
+def get_performance_monitor() -> PerformanceMonitor:
+    """Returns the shared PerformanceMonitor, creating it on first use"""
+    global _performance_monitor
+    if _performance_monitor is None:
+        _performance_monitor = PerformanceMonitor()
+    return _performance_monitor